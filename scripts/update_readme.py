@@ -1,129 +1,302 @@
 #!/usr/bin/env python3
 """
-Regenerate README.md from the Workbench folder structure.
-Run this after adding new entries to update the index.
+Regenerate index.md (or README.md) from the Workbench folder structure.
+Run this after adding new entries to update the index; pass --target readme
+to write README.md with a plain heading instead of Jekyll frontmatter.
 """
 
+import argparse
+import itertools
+import json
+import mmap
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 import re
+import stat
+import tempfile
 
 WORKBENCH_DIR = Path(__file__).parent.parent
-EXCLUDED_DIRS = {'.git', '.github', '_site', 'scripts', '__pycache__'}
+EXCLUDED_DIRS = frozenset({'.git', '.github', 'scripts'})
+CACHE_PATH = WORKBENCH_DIR / 'scripts' / '.readme_cache.json'
+CACHE_VERSION = 6
+HEADER_SIZE = 4096
+DATE_SCAN_SIZE = 500
+DATE_RE = re.compile(rb'(\d{4}-\d{2}-\d{2})')
+# Anchored and reluctant so a missing closing '---' can't backtrack far
+FM_RE = re.compile(rb'\A---\r?\n(.*?)\r?\n---', re.DOTALL)
+TITLE_RE = re.compile(rb'^title:([^\r\n]*)', re.M)
+# Jekyll-style post names like 2026-01-31-some-slug.md
+FNAME_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})-(.+)\.md$')
 
-def get_title_from_file(filepath):
-    """Extract title from frontmatter or first H1 in markdown file."""
+def _find_title(mm):
+    """Return the raw frontmatter or H1 title bytes, or None."""
+    # Check for frontmatter title
+    fm = FM_RE.match(mm, 0, HEADER_SIZE)
+    if fm:
+        match = TITLE_RE.search(fm.group(1))
+        if match:
+            return match.group(1).strip().strip(b'"\'')
+    # Fallback to first H1
+    if mm[:2] == b'# ':
+        start = 2
+    else:
+        i = mm.find(b'\n# ', 0, HEADER_SIZE)
+        start = i + 3 if i != -1 else None
+    if start is None:
+        return None
+    j = mm.find(b'\n', start)
+    if j == -1:
+        j = len(mm)
+    return mm[start:j]
+
+def _scan_header(mm, want_date=True):
+    """Return (title, date) from a mapped file; either may be None."""
+    title = _find_title(mm)
+    if title is not None:
+        try:
+            title = title.decode('utf-8').strip()
+        except UnicodeDecodeError:
+            # Non-UTF-8 files fall back to the filename title
+            title = None
+    if not want_date:
+        return title, None
+    # Look for date patterns like 2026-01-31
+    match = DATE_RE.search(mm, 0, DATE_SCAN_SIZE)
+    date = int(match.group(1).replace(b'-', b'')) if match else None
+    return title, date
+
+def parse_metadata(entry):
+    """Extract title and date from a markdown file with a single mmap.
+
+    Title comes from frontmatter or the first H1, falling back to the
+    filename. Date comes from a YYYY-MM-DD- filename prefix, else the
+    first YYYY-MM-DD in the header, else mtime, and is returned as an
+    int (20260131) so entries sort without a key. `entry` is an
+    os.DirEntry so the mtime fallback can reuse the stat cached by scandir.
+    """
+    title = None
+    date = None
+    stem = os.path.splitext(entry.name)[0]
+    # Dated filenames already carry the date; only the title needs the file
+    fname = FNAME_RE.match(entry.name)
+    if fname:
+        date = int(fname.group(1).replace('-', ''))
+        stem = fname.group(2)
     try:
-        with open(filepath, 'r') as f:
-            content = f.read()
-            # Check for frontmatter title
-            if content.startswith('---'):
-                end = content.find('---', 3)
-                if end != -1:
-                    frontmatter = content[3:end]
-                    for line in frontmatter.split('\n'):
-                        if line.startswith('title:'):
-                            return line[6:].strip().strip('"\'')
-            # Fallback to first H1
-            for line in content.split('\n'):
-                if line.startswith('# '):
-                    return line[2:].strip()
-    except:
+        # mmap can't map an empty file; there's nothing to parse anyway
+        if entry.stat().st_size:
+            fd = os.open(entry.path, os.O_RDONLY)
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    title, header_date = _scan_header(mm, want_date=date is None)
+                    date = date or header_date
+            finally:
+                os.close(fd)
+    except (OSError, ValueError):
         pass
     # Fallback to filename
-    return filepath.stem.replace('-', ' ').title()
+    if title is None:
+        title = stem.replace('-', ' ').title()
+    # Fallback to file modification time
+    if date is None:
+        mtime = entry.stat().st_mtime
+        date = int(datetime.fromtimestamp(mtime).strftime('%Y%m%d'))
+    return title, date
+
+def _new_file_mode(path):
+    """Mode for a rewrite of path: keep the existing mode, else honor umask."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_atomic(path, content):
+    """Write content to path via a temp file in the same dir and os.replace."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        # mkstemp creates the file 0600; match what a plain open() would leave
+        os.chmod(tmp_path, _new_file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
-def get_date_from_file(filepath):
-    """Try to extract date from file, fallback to mtime."""
+def load_cache():
+    """Load cached metadata as {relpath: [mtime_ns, size, title, date]}."""
     try:
-        with open(filepath, 'r') as f:
-            content = f.read(500)
-            # Look for date patterns like 2026-01-31
-            match = re.search(r'(\d{4}-\d{2}-\d{2})', content)
-            if match:
-                return match.group(1)
-    except:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # Discard caches written in an older entry format
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    files = cache.get('files')
+    return files if isinstance(files, dict) else {}
+
+def save_cache(cache):
+    """Persist the metadata cache; failure only costs a re-parse next run."""
+    try:
+        write_atomic(CACHE_PATH, json.dumps({'version': CACHE_VERSION, 'files': cache}))
+    except OSError:
         pass
-    # Fallback to file modification time
-    mtime = os.path.getmtime(filepath)
-    return datetime.fromtimestamp(mtime).strftime('%Y-%m-%d')
 
 def build_index():
     """Build the Workbench index."""
     categories = {}
 
-    for item in sorted(WORKBENCH_DIR.iterdir()):
-        if item.is_dir() and item.name not in EXCLUDED_DIRS and not item.name.startswith('_'):
-            entries = []
-            for md_file in sorted(item.glob('*.md')):
-                title = get_title_from_file(md_file)
-                date = get_date_from_file(md_file)
-                rel_path = md_file.relative_to(WORKBENCH_DIR)
-                entries.append((title, str(rel_path), date))
+    dirs = []
+    with os.scandir(WORKBENCH_DIR) as it:
+        for entry in it:
+            if (not entry.is_dir(follow_symlinks=False)
+                    or entry.name[:1] == '_'
+                    or entry.name in EXCLUDED_DIRS):
+                continue
+            dirs.append(entry)
+    dirs.sort(key=lambda entry: entry.name)
+
+    md_files = []
+    for item in dirs:
+        with os.scandir(item.path) as it:
+            md_files.extend(
+                (item.name, f"{item.name}/{entry.name}", entry)
+                for entry in it
+                if entry.name.endswith('.md') and entry.is_file()
+            )
+
+    # Reuse cached metadata for files whose mtime and size are unchanged.
+    # Rebuilding the cache from scratch drops entries for deleted files.
+    cache = load_cache()
+    fresh = {}
+    misses = []
+    for _, rel_path, md_file in md_files:
+        st = md_file.stat()
+        key = [st.st_mtime_ns, st.st_size]
+        cached = cache.get(rel_path)
+        # Anything that isn't a well-formed entry for this stat is a miss
+        if (isinstance(cached, list) and len(cached) == 4
+                and cached[:2] == key and isinstance(cached[3], int)):
+            fresh[rel_path] = cached
+        else:
+            misses.append((rel_path, md_file, key))
+
+    if misses:
+        # Parsing is I/O-bound, so overlap the reads across a thread pool.
+        with ThreadPoolExecutor(max_workers=min(32, len(misses))) as executor:
+            results = executor.map(parse_metadata, (entry for _, entry, _ in misses))
+            for (rel_path, _, key), (title, date) in zip(misses, results):
+                fresh[rel_path] = key + [title, date]
+
+    if fresh != cache:
+        save_cache(fresh)
 
-            if entries:
-                categories[item.name] = entries
+    for category, rel_path, _ in md_files:
+        _, _, title, date = fresh[rel_path]
+        categories.setdefault(category, []).append((date, title, rel_path))
 
     return categories
 
-def generate_index(categories):
-    """Generate index.md content with Jekyll frontmatter."""
-    lines = [
-        "---",
-        "layout: home",
-        "title: Workbench",
-        "---",
-        "",
-        "Tools, scripts, and workflow improvements I'm building - published as I go.",
-        "",
-        "---",
-        ""
-    ]
-
-    # Count total
+INDEX_FRONTMATTER = [
+    "---",
+    "layout: home",
+    "title: Workbench",
+    "---",
+    "",
+]
+
+README_HEADER = [
+    "# Workbench",
+    "",
+]
+
+INTRO = [
+    "Tools, scripts, and workflow improvements I'm building - published as I go.",
+    "",
+    "---",
+    "",
+]
+
+FOOTER = [
+    "---",
+    "",
+    "## About",
+    "",
+    "This is where I document the tools and systems I build to improve how I work. Not polished blog posts—practical write-ups on things I've actually built and use.",
+    "",
+    "Inspired by [Simon Willison's TIL](https://til.simonwillison.net/).",
+    "",
+    "## License",
+    "",
+    "This work is licensed under a [Creative Commons Attribution 4.0 International License](https://creativecommons.org/licenses/by/4.0/).",
+]
+
+def format_date(date):
+    """Format an int date like 20260131 as 2026-01-31."""
+    return f"{date // 10000:04d}-{date // 100 % 100:02d}-{date % 100:02d}"
+
+def _render_categories(categories):
+    """Yield the project count and per-category entry lines."""
     total = sum(len(entries) for entries in categories.values())
-    lines.append(f"_{total} project{'s' if total != 1 else ''} so far._")
-    lines.append("")
+    yield f"_{total} project{'s' if total != 1 else ''} so far._"
+    yield ""
+
+    # Format category names and dates up front so the loop below is
+    # plain f-strings
+    display_names = {c: c.replace('-', ' ').title() for c in categories}
+    dates = {
+        date: format_date(date)
+        for entries in categories.values()
+        for date, _, _ in entries
+    }
 
-    # Categories
     for category in sorted(categories.keys()):
-        entries = categories[category]
-        # Format category name
-        display_name = category.replace('-', ' ').title()
-        lines.append(f"## {display_name}")
-        lines.append("")
-        for title, path, date in sorted(entries, key=lambda x: x[2], reverse=True):
-            lines.append(f"- [{title}]({path}) - {date}")
-        lines.append("")
-
-    # Footer
-    lines.extend([
-        "---",
-        "",
-        "## About",
-        "",
-        "This is where I document the tools and systems I build to improve how I work. Not polished blog posts—practical write-ups on things I've actually built and use.",
-        "",
-        "Inspired by [Simon Willison's TIL](https://til.simonwillison.net/).",
-        "",
-        "## License",
-        "",
-        "This work is licensed under a [Creative Commons Attribution 4.0 International License](https://creativecommons.org/licenses/by/4.0/).",
-    ])
-
-    return "\n".join(lines)
-
-generate_readme = generate_index  # Alias for backwards compat
+        yield f"## {display_names[category]}"
+        yield ""
+        for date, title, path in sorted(categories[category], reverse=True):
+            yield f"- [{title}]({path}) - {dates[date]}"
+        yield ""
+
+def render(categories, *, frontmatter=None):
+    """Render the index page, optionally preceded by frontmatter lines."""
+    return "\n".join(itertools.chain(
+        frontmatter or (),
+        INTRO,
+        _render_categories(categories),
+        FOOTER,
+    ))
+
+def generate_index(categories):
+    """Generate index.md content with Jekyll frontmatter."""
+    return render(categories, frontmatter=INDEX_FRONTMATTER)
+
+def generate_readme(categories):
+    """Generate README.md content with a plain heading instead of frontmatter."""
+    return render(categories, frontmatter=README_HEADER)
+
+TARGETS = {
+    'index': ("index.md", generate_index),
+    'readme': ("README.md", generate_readme),
+}
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--target', choices=sorted(TARGETS), default='index',
+                        help="which page to regenerate (default: index)")
+    args = parser.parse_args()
+
+    filename, generate = TARGETS[args.target]
     categories = build_index()
-    index_content = generate_index(categories)
+    content = generate(categories)
 
-    index_path = WORKBENCH_DIR / "index.md"
-    with open(index_path, 'w') as f:
-        f.write(index_content)
+    output_path = WORKBENCH_DIR / filename
+    write_atomic(output_path, content)
 
-    print(f"Updated {index_path}")
+    print(f"Updated {output_path}")
     print(f"Categories: {list(categories.keys())}")
     print(f"Total projects: {sum(len(e) for e in categories.values())}")